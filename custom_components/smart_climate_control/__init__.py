@@ -1,27 +1,26 @@
 import logging
 import asyncio
 from datetime import timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
-    CONF_NAME,
     Platform,
     SERVICE_TURN_OFF,
-    SERVICE_TURN_ON,
-    ATTR_TEMPERATURE,
 )
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.core import Event, HomeAssistant, ServiceCall, State, callback
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.storage import Store
-from homeassistant.helpers.entity_platform import async_get_platforms
-from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers import device_registry as dr, entity_registry as er
 
 from .const import (
     DOMAIN,
+    EVENT_STATE_UPDATED,
     CONF_HEAT_PUMP,
     CONF_ROOM_SENSOR,
     CONF_OUTSIDE_SENSOR,
@@ -50,12 +49,36 @@ from .const import (
     DEFAULT_WEATHER_COMP_FACTOR,
     DEFAULT_MAX_COMP_TEMP,
     DEFAULT_MIN_COMP_TEMP,
+    STORAGE_VERSION,
+    STORAGE_MINOR_VERSION,
+    STORAGE_SAVE_DELAY,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.NUMBER, Platform.SWITCH, Platform.SENSOR]
 
+# Seconds a door may stay open before the heat pump is turned off
+_DOOR_OPEN_THRESHOLD = 70.0
+# Seconds to hold off further heat pump commands after one failed
+_COMMAND_RETRY_DELAY = 60.0
+
+_UNAVAILABLE = frozenset(("unknown", "unavailable"))
+_VALID_SCHED_MODES = frozenset(("comfort", "eco", "boost", "off"))
+_PRESENCE_TRACKER_AWAY = frozenset(("away", "not_home", "unknown", "unavailable"))
+_PRESENCE_SENSOR_HOME = frozenset(("home", "on", "true", "1"))
+_PRESENCE_GROUP_HOME = frozenset(("on", "home"))
+_PRESENCE_AWAY = frozenset(("away", "not_home", "not home", "off", "false", "0", "unknown", "unavailable"))
+
+# Fixed control reasons shared by the heating and cooling paths
+REASON_DOOR_OPEN = "Door open"
+REASON_OVERRIDE = "Manual override"
+REASON_NOBODY_HOME = "Nobody home"
+REASON_SCHEDULE_OFF = "Schedule off"
+REASON_HOUSE_LIMIT = "House temp limit"
+REASON_NO_ROOM_TEMP = "No room temp data"
+REASON_DEADBAND = "In deadband"
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Smart Climate Control from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -68,22 +91,57 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "entry": entry,
     }
     
+    @callback
+    def _async_remove_entry_data() -> None:
+        """Drop the entry data, also when setup fails part way."""
+        domain_data = hass.data.get(DOMAIN, {})
+        domain_data.pop(entry.entry_id, None)
+        # Services are shared, remove them with the last entry
+        if not domain_data:
+            for service in ("force_eco", "force_comfort", "reset_temperatures"):
+                hass.services.async_remove(DOMAIN, service)
+    
+    entry.async_on_unload(_async_remove_entry_data)
+    
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    await _setup_device_links(hass, entry)
-    await async_setup_services(hass)
+    # Our device exists once the platforms are set up
+    _async_setup_device_links(hass, entry)
+    # Services are shared by all entries, register them with the first one
+    if not hass.services.has_service(DOMAIN, "force_eco"):
+        await async_setup_services(hass)
     
+    @callback
+    def _async_schedule_update(now=None) -> None:
+        """Run a control pass without holding up the caller."""
+        entry.async_create_background_task(
+            hass, coordinator.async_update(), f"{DOMAIN} update {entry.entry_id}"
+        )
+    
+    # Safety net in case a state change was missed
     entry.async_on_unload(
         async_track_time_interval(
-            hass, coordinator.async_update, timedelta(seconds=60)
+            hass, _async_schedule_update, timedelta(minutes=10)
         )
     )
     
+    @callback
+    def _async_start_control(_hass: HomeAssistant) -> None:
+        """Start controlling once the input entities have loaded."""
+        # Run the control logic when one of its input entities changes
+        coordinator.async_track_inputs()
+        # First pass, so control does not wait for the first state change
+        _async_schedule_update()
+    
+    # While Home Assistant starts the sensors are not loaded yet, a pass then
+    # would turn off a running heat pump for lack of a room temperature
+    entry.async_on_unload(async_at_started(hass, _async_start_control))
+    entry.async_on_unload(coordinator.async_untrack_inputs)
+    
     return True
 
-async def _setup_device_links(hass: HomeAssistant, entry: ConfigEntry) -> None:
+@callback
+def _async_setup_device_links(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Set up device links by moving heat pump entity to our device."""
-    await asyncio.sleep(1)
-    
     entity_reg = er.async_get(hass)
     device_reg = dr.async_get(hass)
     
@@ -144,8 +202,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     if unload_ok:
         coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        # Write pending settings now, a reload would otherwise load stale ones
+        await coordinator.async_flush_settings()
         await coordinator._release_control()
-        hass.data[DOMAIN].pop(entry.entry_id)
     
     return unload_ok
 
@@ -154,43 +213,145 @@ async def async_setup_services(hass: HomeAssistant) -> None:
     
     async def handle_force_eco(call: ServiceCall) -> None:
         """Handle force eco mode service."""
-        for entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            coordinator.force_eco_mode = call.data.get("enable", True)
-            if coordinator.force_eco_mode:
+        coordinators = [data["coordinator"] for data in hass.data[DOMAIN].values()]
+        enable = call.data.get("enable", True)
+        for coordinator in coordinators:
+            coordinator.force_eco_mode = enable
+            if enable:
                 coordinator.force_comfort_mode = False
-            await coordinator.async_update()
+        # Flags are applied, let the control passes run without holding the call open,
+        # each owned by its entry so an unload cancels it
+        for coordinator in coordinators:
+            coordinator.entry.async_create_background_task(
+                hass, coordinator.async_update(), f"{DOMAIN} update {coordinator.entry.entry_id}"
+            )
     
     async def handle_force_comfort(call: ServiceCall) -> None:
         """Handle force comfort mode service."""
-        for entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            coordinator.force_comfort_mode = call.data.get("enable", True)
-            if coordinator.force_comfort_mode:
+        coordinators = [data["coordinator"] for data in hass.data[DOMAIN].values()]
+        enable = call.data.get("enable", True)
+        for coordinator in coordinators:
+            coordinator.force_comfort_mode = enable
+            if enable:
                 coordinator.force_eco_mode = False
-            await coordinator.async_update()
+        # Flags are applied, let the control passes run without holding the call open,
+        # each owned by its entry so an unload cancels it
+        for coordinator in coordinators:
+            coordinator.entry.async_create_background_task(
+                hass, coordinator.async_update(), f"{DOMAIN} update {coordinator.entry.entry_id}"
+            )
     
     async def handle_reset_temperatures(call: ServiceCall) -> None:
         """Handle temperature reset service."""
-        for entry_id in hass.data[DOMAIN]:
-            coordinator = hass.data[DOMAIN][entry_id]["coordinator"]
-            await coordinator.reset_temperatures()
+        coordinators = [data["coordinator"] for data in hass.data[DOMAIN].values()]
+        for coordinator in coordinators:
+            coordinator.entry.async_create_background_task(
+                hass, coordinator.reset_temperatures(), f"{DOMAIN} reset {coordinator.entry.entry_id}"
+            )
     
     hass.services.async_register(DOMAIN, "force_eco", handle_force_eco)
     hass.services.async_register(DOMAIN, "force_comfort", handle_force_comfort)
     hass.services.async_register(DOMAIN, "reset_temperatures", handle_reset_temperatures)
 
+def _presence_tracker_home(state_value: str) -> bool:
+    """Presence from a device_tracker or person."""
+    return state_value not in _PRESENCE_TRACKER_AWAY
+
+def _presence_zone_home(state_value: str) -> bool:
+    """Presence from the number of people in a zone."""
+    try:
+        return int(state_value) > 0
+    except ValueError:
+        return state_value != '0' and state_value not in _UNAVAILABLE
+
+def _presence_sensor_home(state_value: str) -> bool:
+    """Presence from a generic sensor."""
+    if state_value in _PRESENCE_SENSOR_HOME:
+        return True
+    if state_value in _PRESENCE_AWAY:
+        return False
+    _LOGGER.warning(f"Unknown presence state: {state_value}")
+    return True
+
+def _presence_input_boolean_home(state_value: str) -> bool:
+    """Presence from an input_boolean."""
+    return state_value == 'on'
+
+def _presence_group_home(state_value: str) -> bool:
+    """Presence from a group of trackers."""
+    return state_value in _PRESENCE_GROUP_HOME
+
+def _presence_generic_home(state_value: str) -> bool:
+    """Presence from any other entity."""
+    return state_value not in _PRESENCE_AWAY
+
+# Presence check for each tracker domain, resolved once per entry
+_PRESENCE_CHECKS = {
+    'device_tracker': _presence_tracker_home,
+    'person': _presence_tracker_home,
+    'zone': _presence_zone_home,
+    'sensor': _presence_sensor_home,
+    'input_boolean': _presence_input_boolean_home,
+    'group': _presence_group_home,
+}
+
 class SmartClimateCoordinator:
     """Coordinator for Smart Climate Control with heating and cooling support."""
     
+    # Debug text layouts, filled in by _format_debug_text
+    _TPL_COOL_OFF = "COOL OFF | R: {room}°C | {reason}"
+    _TPL_COOL_ON = "COOL ON | {temp} | R: {room}°C | {reason}"
+    _TPL_OFF = "OFF | R: {room}°C | H: {avg}°C | O: {outside} | {reason}"
+    _TPL_ON = "ON | {mode} {temp} | R: {room}°C | H: {avg}°C | O: {outside} | {reason}"
+    
+    # Temperature attribute used for each schedule mode, comfort otherwise
+    _SCHEDULE_TEMP_ATTRS = {"eco": "eco_temp", "boost": "boost_temp"}
+    
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
         self.hass = hass
+        # Bound once, used on the control and command paths
+        self._loop_time = hass.loop.time
+        self._states_get = hass.states.get
         self.entry = entry
         self.config = entry.data
-        self.store = Store(hass, 1, f"{DOMAIN}.{entry.entry_id}")
+        self.store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}", minor_version=STORAGE_MINOR_VERSION)
+        # Last settings handed to the store, to skip writes that change nothing
+        self._persisted = None
         
         self.heat_pump_entity_id = self.config[CONF_HEAT_PUMP]
+        # Service data targeting the heat pump, service calls copy it
+        self._heat_pump_target = {"entity_id": self.heat_pump_entity_id}
+        
+        # Configured entities, resolved once instead of on every pass
+        self._room_sensor = self.config[CONF_ROOM_SENSOR]
+        self._outside_sensor = self.config.get(CONF_OUTSIDE_SENSOR)
+        self._avg_sensor = self.config.get(CONF_AVERAGE_SENSOR)
+        self._door_sensor = self.config.get(CONF_DOOR_SENSOR)
+        self._presence_tracker = self.config.get(CONF_PRESENCE_TRACKER)
+        # Only the first bed sensor drives sleep mode
+        self._bed_sensor = next(iter(self.config.get(CONF_BED_SENSORS) or ()), None)
+        self._contact_sensor = self.config.get(CONF_HEAT_PUMP_CONTACT)
+        
+        # Sensors read on every control pass (schedule entity may come from options)
+        self._input_entity_ids = tuple(
+            entity_id
+            for entity_id in (
+                self._room_sensor,
+                self._outside_sensor,
+                self._avg_sensor,
+                self._door_sensor,
+                self._presence_tracker,
+                self._bed_sensor,
+            )
+            if entity_id
+        )
+        self._presence_check = _PRESENCE_CHECKS.get(
+            (self._presence_tracker or "").split('.')[0], _presence_generic_home
+        )
+        
+        # Settings that can be changed through the options flow
+        self._load_options()
         
         # State variables
         self.smart_control_enabled = True
@@ -201,14 +362,29 @@ class SmartClimateCoordinator:
         self.current_action = "off"
         self.current_hvac_mode = "heat"  # Track whether we're heating or cooling
         self.last_avg_house_over_limit = False
-        self.door_open_time = None
+        self._door_latched = False
+        self._cancel_door_timer = None
+        self._cancel_pending_update = None
+        self._unsub_state_listener = None
+        self._update_running = False
+        self._update_pending = False
+        self._verify_task: Optional[asyncio.Task] = None
         self.sleep_mode_active = False
         self.debug_text = "System initializing..."
         self.smart_control_active = False
+        self._last_input_hash = None
         
-        self.last_sent_action = None
-        self.last_sent_temperature = None
-        self.last_sent_hvac_mode = None
+        # (action, temperature, hvac_mode) last applied to the heat pump
+        self._last_sent = None
+        # loop time before which no new command is sent after a failure
+        self._command_retry_at = 0.0
+        self._cancel_command_retry = None
+        # Bumped on release, so a command that was in flight is not recorded
+        self._control_generation = 0
+        # (action, temperature) of the last state_updated event
+        self._last_published = None
+        # entity_id -> (State, parsed value); HA keeps the State object until it changes
+        self._float_cache: Dict[str, Tuple[State, Optional[float]]] = {}
         
         # Temperature settings
         self.comfort_temp = self.config.get(CONF_COMFORT_TEMP, DEFAULT_COMFORT_TEMP)
@@ -216,373 +392,616 @@ class SmartClimateCoordinator:
         self.boost_temp = self.config.get(CONF_BOOST_TEMP, DEFAULT_BOOST_TEMP)
         self.cooling_temp = self.config.get(CONF_COOLING_TEMP, DEFAULT_COOLING_TEMP)
         
-        self.entry.add_update_listener(self.async_options_updated)
+        entry.async_on_unload(entry.add_update_listener(self.async_options_updated))
     
     def _get_config_value(self, key: str, default: Any) -> Any:
         """Get value from options (preferred) or config (fallback)."""
-        if key in self.entry.options:
-            return self.entry.options[key]
-        return self.config.get(key, default)
+        return self._merged_config.get(key, default)
+    
+    def _load_options(self) -> None:
+        """Resolve the settings that can be changed through options."""
+        # Options override the initial configuration
+        self._merged_config = {**self.config, **self.entry.options}
+        self._deadband_below = self._get_config_value(CONF_DEADBAND_BELOW, DEFAULT_DEADBAND)
+        self._deadband_above = self._get_config_value(CONF_DEADBAND_ABOVE, DEFAULT_DEADBAND)
+        self._max_house_temp = self._get_config_value(CONF_MAX_HOUSE_TEMP, DEFAULT_MAX_HOUSE_TEMP)
+        self._weather_comp_factor = self._get_config_value(CONF_WEATHER_COMP_FACTOR, DEFAULT_WEATHER_COMP_FACTOR)
+        self._max_comp_temp = self._get_config_value(CONF_MAX_COMP_TEMP, DEFAULT_MAX_COMP_TEMP)
+        self._min_comp_temp = self._get_config_value(CONF_MIN_COMP_TEMP, DEFAULT_MIN_COMP_TEMP)
+        self._schedule_entity = self.entry.options.get(CONF_SCHEDULE_ENTITY) or self.config.get(CONF_SCHEDULE_ENTITY)
     
     @property
     def deadband_below(self) -> float:
-        return self._get_config_value(CONF_DEADBAND_BELOW, DEFAULT_DEADBAND)
+        return self._deadband_below
     
     @property
     def deadband_above(self) -> float:
-        return self._get_config_value(CONF_DEADBAND_ABOVE, DEFAULT_DEADBAND)
+        return self._deadband_above
     
     @property
     def max_house_temp(self) -> float:
-        return self._get_config_value(CONF_MAX_HOUSE_TEMP, DEFAULT_MAX_HOUSE_TEMP)
+        return self._max_house_temp
     
     @property
     def weather_comp_factor(self) -> float:
-        return self._get_config_value(CONF_WEATHER_COMP_FACTOR, DEFAULT_WEATHER_COMP_FACTOR)
+        return self._weather_comp_factor
     
     @property
     def max_comp_temp(self) -> float:
-        return self._get_config_value(CONF_MAX_COMP_TEMP, DEFAULT_MAX_COMP_TEMP)
+        return self._max_comp_temp
     
     @property
     def min_comp_temp(self) -> float:
-        return self._get_config_value(CONF_MIN_COMP_TEMP, DEFAULT_MIN_COMP_TEMP)
+        return self._min_comp_temp
+    
+    @property
+    def schedule_entity_id(self) -> Optional[str]:
+        """Schedule entity from options (preferred) or config (fallback)."""
+        return self._schedule_entity
     
     @staticmethod
     async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Handle options update."""
         if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
             coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+            coordinator._load_options()
+            # The schedule entity may have changed
+            coordinator.async_track_inputs()
             # Update cooling_temp from options if it exists
             coordinator.cooling_temp = coordinator._get_config_value(CONF_COOLING_TEMP, DEFAULT_COOLING_TEMP)
+            # Options are not part of the input hash, force a full control pass
+            coordinator._last_input_hash = None
             await coordinator.async_update()
     
     async def async_initialize(self) -> None:
         """Initialize the coordinator."""
         stored_data = await self.store.async_load()
         if stored_data:
-            self.comfort_temp = stored_data.get("comfort_temp", self.comfort_temp)
-            self.eco_temp = stored_data.get("eco_temp", self.eco_temp)
-            self.boost_temp = stored_data.get("boost_temp", self.boost_temp)
-            self.cooling_temp = stored_data.get("cooling_temp", self.cooling_temp)
-            self.smart_control_enabled = stored_data.get("smart_control_enabled", True)
+            # Merge over the current settings, keeping defaults for missing or malformed
+            # fields, the keys are the attribute names
+            for key, current in self._settings_data().items():
+                if key not in stored_data:
+                    continue
+                value = stored_data[key]
+                if isinstance(current, bool):
+                    valid = isinstance(value, bool)
+                else:
+                    valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if valid:
+                    setattr(self, key, value)
+                else:
+                    _LOGGER.warning(f"Ignoring stored {key}: {value!r}")
+            
+            self._persisted = self._settings_data()
             
         _LOGGER.info(f"Smart Climate Control initialized - enabled: {self.smart_control_enabled}")
     
+    def _settings_data(self) -> Dict[str, Any]:
+        """Return the settings that are persisted across restarts."""
+        return {
+            "comfort_temp": self.comfort_temp,
+            "eco_temp": self.eco_temp,
+            "boost_temp": self.boost_temp,
+            "cooling_temp": self.cooling_temp,
+            "smart_control_enabled": self.smart_control_enabled,
+        }
+    
+    @callback
+    def async_save_settings(self) -> None:
+        """Persist the settings if they changed since the last write."""
+        data = self._settings_data()
+        if data == self._persisted:
+            return
+        self._persisted = data
+        # Delayed save coalesces rapid changes such as slider drags into one write
+        self.store.async_delay_save(lambda: data, STORAGE_SAVE_DELAY)
+    
+    async def async_flush_settings(self) -> None:
+        """Write the settings immediately, replacing any delayed save."""
+        self._persisted = self._settings_data()
+        await self.store.async_save(self._persisted)
+    
+    @callback
+    def async_track_inputs(self) -> None:
+        """Listen for state changes of the entities the control pass reads."""
+        self.async_untrack_inputs()
+        entity_ids = [*self._input_entity_ids, self.heat_pump_entity_id]
+        if self._schedule_entity:
+            entity_ids.append(self._schedule_entity)
+        self._unsub_state_listener = async_track_state_change_event(
+            self.hass, entity_ids, self._handle_state_event
+        )
+    
+    @callback
+    def async_untrack_inputs(self) -> None:
+        """Stop listening for input state changes."""
+        if self._unsub_state_listener:
+            self._unsub_state_listener()
+            self._unsub_state_listener = None
+    
+    @callback
+    def _handle_state_event(self, event: Event) -> None:
+        """Handle a state change of one of the watched input entities."""
+        # Sensor changes cannot affect anything while smart control is disabled
+        if not self.smart_control_enabled:
+            return
+        entity_id = event.data["entity_id"]
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        if entity_id == self.heat_pump_entity_id:
+            # Only the mode and setpoint are compared, ignore updates such as
+            # current_temperature or hvac_action
+            if (
+                old_state and new_state and old_state.state == new_state.state
+                and old_state.attributes.get("temperature") == new_state.attributes.get("temperature")
+            ):
+                return
+            if self._last_sent is not None:
+                if self._heat_pump_matches(new_state, self._last_sent):
+                    return
+                # Changed outside our control, send the command again
+                _LOGGER.debug("Heat pump %s no longer matches the last command", entity_id)
+                self._last_sent = None
+            # Also reached while no command is applied yet, e.g. the heat pump
+            # was missing, so the next pass gets past the gatekeeper
+            self._last_input_hash = None
+        # Only the state itself is used, ignore attribute-only updates, except
+        # for the schedule whose mode lives in an attribute
+        elif (
+            old_state and new_state and old_state.state == new_state.state
+            and entity_id != self._schedule_entity
+        ):
+            return
+        # Debounce, so a burst of sensor updates results in a single pass
+        self._cancel_pending_state_update()
+        self._cancel_pending_update = async_call_later(
+            self.hass, 0.25, self._async_debounced_update
+        )
+    
+    async def _async_debounced_update(self, now=None) -> None:
+        """Run the control pass scheduled by a state change."""
+        self._cancel_pending_update = None
+        await self.async_update()
+    
+    def _cancel_pending_state_update(self) -> None:
+        """Cancel the debounced control pass, if any."""
+        if self._cancel_pending_update:
+            self._cancel_pending_update()
+            self._cancel_pending_update = None
+    
     async def async_update(self, now=None) -> None:
-        """Update climate control logic."""
+        """Update climate control logic, coalescing calls made during a pass."""
+        if self._update_running:
+            # The running pass repeats once it finishes, with fresh inputs
+            self._update_pending = True
+            return
+        
+        self._update_running = True
         try:
-            if not self.smart_control_enabled:
-                if self.smart_control_active:
-                    await self._release_control()
-                return
-            
-            self.smart_control_active = True
-            
-            # Get sensor values
-            room_temp = await self._get_sensor_value(self.config[CONF_ROOM_SENSOR])
-            outside_temp = None
-            if self.config.get(CONF_OUTSIDE_SENSOR):
-                outside_temp = await self._get_sensor_value(self.config[CONF_OUTSIDE_SENSOR], 5.0)
-            else:
-                outside_temp = 5.0
-            
-            # Simplified for cooling - only check door status
-            door_open = await self._check_door_status()
-            
-            # For HEATING mode - use full logic
-            if self.current_hvac_mode == "heat":
-                avg_house_temp = await self._get_sensor_value(self.config.get(CONF_AVERAGE_SENSOR))
-                await self._check_sleep_status()
-                await self._check_schedule_status()
-                base_temp = self._determine_base_temperature()
-                
-                action, temperature, reason = await self._calculate_heating_control(
-                    room_temp, outside_temp, avg_house_temp, base_temp, door_open
-                )
-                
-                # Apply weather compensation for heating
-                weather_compensation = 0
-                original_temperature = temperature
-                has_outside_sensor = self.config.get(CONF_OUTSIDE_SENSOR) is not None
-                
-                if action == "on" and has_outside_sensor and outside_temp < 0 and temperature is not None:
-                    weather_compensation = min(abs(outside_temp) * self.weather_comp_factor, 5.0)
-                    temperature = min(temperature + weather_compensation, self.max_comp_temp)
-                    temperature = max(temperature, self.min_comp_temp)
-                    temperature = round(temperature)
-                
-                self.debug_text = self._format_debug_text(
-                    action, temperature, room_temp, None, outside_temp, reason,
-                    original_temperature, weather_compensation, has_outside_sensor, "heat"
-                )
+            while True:
+                self._update_pending = False
+                await self._async_control_pass()
+                if not self._update_pending:
+                    break
+        finally:
+            self._update_running = False
+    
+    async def _async_control_pass(self) -> None:
+        """Run a single pass of the control logic."""
+        if not self.smart_control_enabled:
+            if self.smart_control_active:
+                await self._release_control()
+            return
+        
+        self.smart_control_active = True
+        
+        # Read every input entity once for this pass
+        states = self._snapshot_states()
+        
+        # Gatekeeper: nothing to do if no input changed since the last pass
+        input_hash = self._compute_input_hash(states)
+        if input_hash == self._last_input_hash:
+            return
+        self._last_input_hash = input_hash
+        
+        # Get sensor values
+        room_temp = self._get_sensor_value(states.get(self._room_sensor))
+        outside_temp = None
+        if self._outside_sensor:
+            outside_temp = self._get_sensor_value(states.get(self._outside_sensor), 5.0)
+        else:
+            outside_temp = 5.0
+        
+        # Simplified for cooling - only check door status
+        door_open = self._check_door_status(states.get(self._door_sensor))
+        
+        # For HEATING mode - use full logic
+        if self.current_hvac_mode == "heat":
+            avg_house_temp = self._get_sensor_value(states.get(self._avg_sensor))
+            self._check_sleep_status(states.get(self._bed_sensor))
+            self._check_schedule_status(states.get(self._schedule_entity))
+            base_temp = self._determine_base_temperature()
             
-            # For COOLING mode - simplified logic
-            else:  # cooling
-                base_temp = self.cooling_temp
-                action, temperature, reason = await self._calculate_cooling_control(
-                    room_temp, base_temp, door_open
-                )
-                
-                self.debug_text = self._format_debug_text(
-                    action, temperature, room_temp, None, None, reason,
-                    None, 0, False, "cool"
-                )
+            action, temperature, reason = self._calculate_heating_control(
+                room_temp, outside_temp, avg_house_temp, base_temp, door_open,
+                states.get(self._presence_tracker)
+            )
             
-            self.current_action = action
+            # Apply weather compensation for heating
+            weather_compensation = 0
+            original_temperature = temperature
+            has_outside_sensor = self._outside_sensor is not None
             
-            # Control heat pump
-            await self._control_heat_pump_directly(action, temperature, self.current_hvac_mode)
+            if action == "on" and has_outside_sensor and outside_temp < 0 and temperature is not None:
+                weather_compensation = -outside_temp * self._weather_comp_factor
+                if weather_compensation > 5.0:
+                    weather_compensation = 5.0
+                temperature += weather_compensation
+                if temperature > self._max_comp_temp:
+                    temperature = self._max_comp_temp
+                if temperature < self._min_comp_temp:
+                    temperature = self._min_comp_temp
+                temperature = round(temperature)
             
-            # Verify it's running (if contact sensor configured)
-            await self._verify_heat_pump_with_contact_sensor()
+            self._debug_args = (
+                action, temperature, room_temp, None, outside_temp, reason,
+                original_temperature, weather_compensation, has_outside_sensor, "heat",
+                self._heating_mode_label(),
+            )
+        
+        # For COOLING mode - simplified logic
+        else:  # cooling
+            base_temp = self.cooling_temp
+            action, temperature, reason = self._calculate_cooling_control(
+                room_temp, base_temp, door_open,
+                states.get(self._presence_tracker)
+            )
             
-            # Fire event for state update
-            self.hass.bus.async_fire(f"{DOMAIN}_state_updated", {
+            self._debug_args = (
+                action, temperature, room_temp, None, None, reason,
+                None, 0, False, "cool"
+            )
+        
+        self.current_action = action
+        
+        # Control heat pump
+        await self._control_heat_pump_directly(action, temperature, self.current_hvac_mode)
+        
+        # Verify it's running (if contact sensor configured), in the background
+        # because the check waits for the vents to react
+        if self._contact_sensor and action == "on" and (
+            self._verify_task is None or self._verify_task.done()
+        ):
+            self._verify_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_verify_heat_pump(),
+                f"{DOMAIN} verify {self.heat_pump_entity_id}",
+            )
+        
+        # Fire event for state update, only when the outcome changed
+        if (action, temperature) != self._last_published:
+            self._last_published = (action, temperature)
+            self.hass.bus.async_fire(EVENT_STATE_UPDATED, {
                 "entry_id": self.entry.entry_id,
                 "action": action,
                 "temperature": temperature,
                 "debug": self.debug_text,
             })
-            
-        except Exception as e:
-            _LOGGER.error(f"Error in climate control update: {e}")
-            self.debug_text = f"Error: {str(e)}"
     
-    async def _get_sensor_value(self, entity_id: str, default: Optional[float] = None) -> Optional[float]:
+    def _snapshot_states(self) -> Dict[str, Optional[State]]:
+        """Get the current state of all input entities in a single pass."""
+        get_state = self._states_get
+        states = {entity_id: get_state(entity_id) for entity_id in self._input_entity_ids}
+        
+        if self._schedule_entity:
+            states[self._schedule_entity] = get_state(self._schedule_entity)
+        
+        return states
+    
+    def _compute_input_hash(self, states: Dict[str, Optional[State]]) -> int:
+        """Hash every input that can change the outcome of a control pass."""
+        
+        def raw(entity_id: Optional[str]) -> Optional[str]:
+            state = states.get(entity_id)
+            return state.state if state else None
+        
+        schedule_state = states.get(self._schedule_entity)
+        
+        return hash((
+            raw(self._room_sensor),
+            raw(self._outside_sensor),
+            raw(self._avg_sensor),
+            raw(self._door_sensor),
+            raw(self._presence_tracker),
+            raw(self._bed_sensor),
+            schedule_state.state if schedule_state else None,
+            schedule_state.attributes.get("mode") if schedule_state else None,
+            self.current_hvac_mode,
+            self.force_eco_mode,
+            self.force_comfort_mode,
+            self.override_mode,
+            self._door_latched,
+            self.comfort_temp,
+            self.eco_temp,
+            self.boost_temp,
+            self.cooling_temp,
+        ))
+    
+    @callback
+    def _get_sensor_value(self, state: Optional[State], default: Optional[float] = None) -> Optional[float]:
         """Get sensor value with validation."""
-        if not entity_id:
+        if state is None:
             return default
         
-        state = self.hass.states.get(entity_id)
-        if state is None or state.state in ["unknown", "unavailable"]:
-            return default
+        cached = self._float_cache.get(state.entity_id)
+        if cached is not None and cached[0] is state:
+            value = cached[1]
+            return default if value is None else value
         
-        try:
-            value = float(state.state)
-            if -50 <= value <= 50:
-                return value
-        except (ValueError, TypeError):
-            pass
+        value = None
+        if state.state not in _UNAVAILABLE:
+            try:
+                parsed = float(state.state)
+            except (ValueError, TypeError):
+                parsed = None
+            if parsed is not None and -50 <= parsed <= 50:
+                value = parsed
         
-        return default
+        self._float_cache[state.entity_id] = (state, value)
+        return default if value is None else value
     
-    async def _check_door_status(self) -> bool:
+    @callback
+    def _check_door_status(self, state: Optional[State]) -> bool:
         """Check if door has been open too long."""
-        door_sensor = self.config.get(CONF_DOOR_SENSOR)
-        if not door_sensor:
-            return False
-        
-        state = self.hass.states.get(door_sensor)
         if state and state.state == "on":
-            if self.door_open_time is None:
-                self.door_open_time = self.hass.loop.time()
-            elif self.hass.loop.time() - self.door_open_time > 70:
-                return True
-        else:
-            self.door_open_time = None
+            if not self._door_latched and self._cancel_door_timer is None:
+                self._cancel_door_timer = async_call_later(
+                    self.hass, _DOOR_OPEN_THRESHOLD, self._async_door_open_too_long
+                )
+            return self._door_latched
         
+        self._door_latched = False
+        self._cancel_door_open_timer()
         return False
+    
+    async def _async_door_open_too_long(self, now=None) -> None:
+        """Latch the door as open too long and run a control pass."""
+        self._cancel_door_timer = None
+        self._door_latched = True
+        await self.async_update()
+    
+    def _cancel_door_open_timer(self) -> None:
+        """Cancel the pending door-open re-check, if any."""
+        if self._cancel_door_timer:
+            self._cancel_door_timer()
+            self._cancel_door_timer = None
  
-    async def _check_sleep_status(self) -> None:
+    @callback
+    def _check_sleep_status(self, bed_state: Optional[State]) -> None:
         """Check if sleep mode should be active (heating only)."""
-        bed_sensors = self.config.get(CONF_BED_SENSORS, [])
-        if len(bed_sensors) >= 1:
-            bed_sensor = self.hass.states.get(bed_sensors[0])
-            if bed_sensor:
-                self.sleep_mode_active = (bed_sensor.state == "on")
+        if bed_state:
+            self.sleep_mode_active = (bed_state.state == "on")
     
-    async def _check_schedule_status(self) -> None:
+    @callback
+    def _check_schedule_status(self, state: Optional[State]) -> None:
         """Check schedule entity for current mode (heating only)."""
-        schedule_entity = self.entry.options.get(CONF_SCHEDULE_ENTITY) or self.config.get(CONF_SCHEDULE_ENTITY)
-        
-        if not schedule_entity:
-            self.schedule_mode = "comfort"
-            return
-        
-        state = self.hass.states.get(schedule_entity)
         if not state:
             self.schedule_mode = "comfort"
             return
         
         if "mode" in state.attributes:
-            mode = state.attributes.get("mode", "comfort")
-            valid_modes = ["comfort", "eco", "boost", "off"]
-            if mode.lower() in valid_modes:
-                self.schedule_mode = mode.lower()
-            else:
-                self.schedule_mode = "comfort"
+            mode = str(state.attributes["mode"]).lower()
+            self.schedule_mode = mode if mode in _VALID_SCHED_MODES else "comfort"
         else:
             if state.state == "on":
                 self.schedule_mode = "comfort"
             else:
                 self.schedule_mode = "eco"
             
-    async def _check_presence_status(self) -> bool:
+    @callback
+    def _check_presence_status(self, state: Optional[State]) -> bool:
         """Check if someone is home based on presence tracker."""
-        presence_tracker = self.config.get(CONF_PRESENCE_TRACKER)
+        presence_tracker = self._presence_tracker
         if not presence_tracker:
             return True
         
-        state = self.hass.states.get(presence_tracker)
         if not state:
             _LOGGER.warning(f"Presence tracker {presence_tracker} not found")
             return True
         
-        state_value = str(state.state).lower().strip()
-        entity_domain = presence_tracker.split('.')[0]
-        
-        if entity_domain in ['device_tracker', 'person']:
-            return state_value not in ['away', 'not_home', 'unknown', 'unavailable']
-        elif entity_domain == 'zone':
-            try:
-                return int(state.state) > 0
-            except:
-                return state_value not in ['0', 'unknown', 'unavailable']
-        elif entity_domain == 'sensor':
-            if state_value in ['home', 'on', 'true', '1']:
-                return True
-            elif state_value in ['away', 'not_home', 'not home', 'off', 'false', '0', 'unknown', 'unavailable']:
-                return False
-            else:
-                _LOGGER.warning(f"Unknown presence state: {state.state}")
-                return True
-        elif entity_domain == 'input_boolean':
-            return state_value == 'on'
-        elif entity_domain == 'group':
-            return state_value in ['on', 'home']
-        else:
-            return state_value not in ['away', 'not_home', 'not home', 'off', '0', 'false', 'unknown', 'unavailable']
+        return self._presence_check(state.state.lower().strip())
  
     def _determine_base_temperature(self) -> float:
         """Determine the base target temperature (heating only)."""
         if self.force_comfort_mode:
             return self.comfort_temp
-        elif self.force_eco_mode or self.sleep_mode_active:
-            return self.eco_temp
-        elif self.override_mode:
-            return self.comfort_temp
-        elif self.schedule_mode == "eco":
+        if self.force_eco_mode or self.sleep_mode_active:
             return self.eco_temp
-        elif self.schedule_mode == "boost":
-            return self.boost_temp
-        elif self.schedule_mode == "off":
-            return self.comfort_temp
-        else:
+        if self.override_mode:
             return self.comfort_temp
+        return getattr(self, self._SCHEDULE_TEMP_ATTRS.get(self.schedule_mode, "comfort_temp"))
     
-    async def _calculate_heating_control(
+    @callback
+    def _calculate_heating_control(
         self, room_temp: Optional[float], outside_temp: float,
-        avg_house_temp: Optional[float], base_temp: float, door_open: bool
+        avg_house_temp: Optional[float], base_temp: float, door_open: bool,
+        presence_state: Optional[State]
     ) -> tuple[str, Optional[float], str]:
         """Calculate heating control action and temperature."""
         if door_open:
-            return "off", base_temp, "Door open"
+            return "off", base_temp, REASON_DOOR_OPEN
         
         if self.override_mode:
-            return "on", base_temp, "Manual override"
+            return "on", base_temp, REASON_OVERRIDE
             
-        someone_home = await self._check_presence_status()
+        someone_home = self._check_presence_status(presence_state)
         if not someone_home:
-            return "off", base_temp, "Nobody home"
+            return "off", base_temp, REASON_NOBODY_HOME
         
         if self.schedule_mode == "off" and not self.force_eco_mode:
-            return "off", base_temp, "Schedule off"
+            return "off", base_temp, REASON_SCHEDULE_OFF
         
         if avg_house_temp is not None:
             if self.last_avg_house_over_limit:
-                if avg_house_temp > (self.max_house_temp - 0.5):
-                    return "off", base_temp, "House temp limit"
-            elif avg_house_temp > self.max_house_temp:
+                if avg_house_temp > (self._max_house_temp - 0.5):
+                    return "off", base_temp, REASON_HOUSE_LIMIT
+            elif avg_house_temp > self._max_house_temp:
                 self.last_avg_house_over_limit = True
-                return "off", base_temp, "House temp limit"
+                return "off", base_temp, REASON_HOUSE_LIMIT
             else:
                 self.last_avg_house_over_limit = False
         
         if room_temp is None:
-            return "off", base_temp, "No room temp data"
+            return "off", base_temp, REASON_NO_ROOM_TEMP
         
         # Deadband control for HEATING
-        turn_on_temp = base_temp - self.deadband_below
-        turn_off_temp = base_temp + self.deadband_above
+        turn_on_temp = base_temp - self._deadband_below
+        turn_off_temp = base_temp + self._deadband_above
         
         if room_temp <= turn_on_temp:
             return "on", base_temp, f"Heating needed ({room_temp:.1f}°C <= {turn_on_temp:.1f}°C)"
         elif room_temp >= turn_off_temp:
             return "off", base_temp, f"Too hot ({room_temp:.1f}°C >= {turn_off_temp:.1f}°C)"
         else:
-            return self.current_action, base_temp, "In deadband"
+            return self.current_action, base_temp, REASON_DEADBAND
     
-    async def _calculate_cooling_control(
-        self, room_temp: Optional[float], base_temp: float, door_open: bool
+    @callback
+    def _calculate_cooling_control(
+        self, room_temp: Optional[float], base_temp: float, door_open: bool,
+        presence_state: Optional[State]
     ) -> tuple[str, Optional[float], str]:
         """Calculate cooling control action and temperature (simplified)."""
         if door_open:
-            return "off", base_temp, "Door open"
+            return "off", base_temp, REASON_DOOR_OPEN
         
-        someone_home = await self._check_presence_status()
+        someone_home = self._check_presence_status(presence_state)
         if not someone_home:
-            return "off", base_temp, "Nobody home"
+            return "off", base_temp, REASON_NOBODY_HOME
         
         if room_temp is None:
-            return "off", base_temp, "No room temp data"
+            return "off", base_temp, REASON_NO_ROOM_TEMP
         
         # INVERTED deadband control for COOLING
-        turn_on_temp = base_temp + self.deadband_above  # Cool when ABOVE target
-        turn_off_temp = base_temp - self.deadband_below  # Stop when BELOW target
+        turn_on_temp = base_temp + self._deadband_above  # Cool when ABOVE target
+        turn_off_temp = base_temp - self._deadband_below  # Stop when BELOW target
         
         if room_temp >= turn_on_temp:
             return "on", base_temp, f"Cooling needed ({room_temp:.1f}°C >= {turn_on_temp:.1f}°C)"
         elif room_temp <= turn_off_temp:
             return "off", base_temp, f"Too cold ({room_temp:.1f}°C <= {turn_off_temp:.1f}°C)"
         else:
-            return self.current_action, base_temp, "In deadband"
+            return self.current_action, base_temp, REASON_DEADBAND
+    
+    @staticmethod
+    def _heat_pump_matches(
+        state: Optional[State], command: Tuple[str, Optional[float], str]
+    ) -> bool:
+        """Return True if the heat pump state reflects the given command."""
+        if state is None:
+            return False
+        action, temperature, hvac_mode = command
+        if action == "off":
+            return state.state == "off"
+        if state.state != hvac_mode:
+            return False
+        current_temp = state.attributes.get("temperature")
+        if current_temp is None or temperature is None:
+            return current_temp == temperature
+        # Devices may round the setpoint to their own step, only used to spot
+        # outside changes, new commands still compare exactly
+        step = state.attributes.get("target_temp_step") or 0.5
+        return abs(current_temp - temperature) < step
     
-    async def _control_heat_pump_directly(self, action: str, temperature: Optional[float], hvac_mode: str) -> None:
+    async def _control_heat_pump_directly(
+        self, action: str, temperature: Optional[float], hvac_mode: str
+    ) -> None:
         """Control the heat pump entity directly."""
-        # Check if we need to send a command
-        if action == self.last_sent_action and temperature == self.last_sent_temperature and hvac_mode == self.last_sent_hvac_mode:
+        # Check if we need to send a command, the temperature is irrelevant when off
+        desired = (action, temperature if action == "on" else None, hvac_mode)
+        if desired == self._last_sent:
             return
-            
-        heat_pump_state = self.hass.states.get(self.heat_pump_entity_id)
+        
+        # Back off after a failed command instead of retrying on every sensor change
+        now = self._loop_time()
+        if now < self._command_retry_at:
+            # Nothing was sent, run a pass again once the hold-off ends
+            self._last_input_hash = None
+            if self._cancel_command_retry is None:
+                self._cancel_command_retry = async_call_later(
+                    self.hass, self._command_retry_at - now, self._async_retry_command
+                )
+            return
+        
+        # Only read the heat pump when a command may actually be needed
+        heat_pump_state = self._states_get(self.heat_pump_entity_id)
         if not heat_pump_state:
             _LOGGER.error(f"Heat pump entity {self.heat_pump_entity_id} not found")
+            # Try again when the heat pump shows up
+            self._last_input_hash = None
             return
             
         current_hvac_mode = heat_pump_state.state
-        current_temp = heat_pump_state.attributes.get('temperature')
+        generation = self._control_generation
         
-        self.last_sent_action = action
-        self.last_sent_temperature = temperature
-        self.last_sent_hvac_mode = hvac_mode
+        try:
+            if action == "on" and temperature is not None:
+                current_temp = heat_pump_state.attributes.get('temperature')
+                if current_hvac_mode != hvac_mode or current_temp != temperature:
+                    _LOGGER.info(f"Smart Climate: Setting heat pump to {hvac_mode} at {temperature}°C")
+                    await self.hass.services.async_call(
+                        "climate",
+                        "set_temperature",
+                        {
+                            "entity_id": self.heat_pump_entity_id,
+                            "temperature": temperature,
+                            "hvac_mode": hvac_mode,
+                        },
+                        blocking=True,
+                    )
+                        
+            elif action == "off":
+                if current_hvac_mode != "off":
+                    _LOGGER.info(f"Smart Climate: Turning off heat pump")
+                    await self.hass.services.async_call(
+                        "climate",
+                        SERVICE_TURN_OFF,
+                        self._heat_pump_target,
+                        blocking=True,
+                    )
+        except Exception:
+            # Service schemas and device libraries raise more than HomeAssistantError.
+            # Not recorded as sent and gatekeeper reset, so the next pass retries
+            _LOGGER.exception(f"Smart Climate: Failed to control heat pump {self.heat_pump_entity_id}")
+            if generation == self._control_generation:
+                self._last_input_hash = None
+                self._command_retry_at = now + _COMMAND_RETRY_DELAY
+            return
         
-        if action == "on" and temperature is not None:
-            if current_hvac_mode != hvac_mode or current_temp != temperature:
-                _LOGGER.info(f"Smart Climate: Setting heat pump to {hvac_mode} at {temperature}°C")
-                await self.hass.services.async_call(
-                    "climate",
-                    "set_temperature",
-                    {
-                        "entity_id": self.heat_pump_entity_id,
-                        "temperature": temperature,
-                        "hvac_mode": hvac_mode,
-                    },
-                    blocking=True,
-                )
-                    
-        elif action == "off":
-            if current_hvac_mode != "off":
-                _LOGGER.info(f"Smart Climate: Turning off heat pump")
-                await self.hass.services.async_call(
-                    "climate",
-                    SERVICE_TURN_OFF,
-                    {"entity_id": self.heat_pump_entity_id},
-                    blocking=True,
-                )
+        # Control may have been released while the call was awaited
+        if generation == self._control_generation:
+            self._last_sent = desired
+    
+    async def _async_retry_command(self, now=None) -> None:
+        """Run the control pass held off by a failed command."""
+        self._cancel_command_retry = None
+        await self.async_update()
+    
+    def _cancel_command_retry_timer(self) -> None:
+        """Cancel the pending retry after a failed command, if any."""
+        if self._cancel_command_retry:
+            self._cancel_command_retry()
+            self._cancel_command_retry = None
+    
+    async def _async_verify_heat_pump(self) -> None:
+        """Run the contact sensor verification, logging service failures."""
+        try:
+            await self._verify_heat_pump_with_contact_sensor()
+        except Exception:
+            _LOGGER.exception("Smart Climate: Heat pump verification failed")
     
     async def _verify_heat_pump_with_contact_sensor(self) -> None:
         """Verify heat pump is actually running using contact sensor."""
-        contact_sensor = self.config.get(CONF_HEAT_PUMP_CONTACT)
+        contact_sensor = self._contact_sensor
         if not contact_sensor:
             return
         
@@ -591,7 +1010,7 @@ class SmartClimateCoordinator:
         
         await asyncio.sleep(20)
         
-        vent_state = self.hass.states.get(contact_sensor)
+        vent_state = self._states_get(contact_sensor)
         if not vent_state:
             _LOGGER.warning(f"Contact sensor {contact_sensor} not found")
             return
@@ -601,7 +1020,7 @@ class SmartClimateCoordinator:
         if not vents_open:
             _LOGGER.warning(f"⚠️  Heat pump command may have failed - contact sensor shows not running. Retrying...")
             
-            heat_pump_state = self.hass.states.get(self.heat_pump_entity_id)
+            heat_pump_state = self._states_get(self.heat_pump_entity_id)
             if heat_pump_state:
                 current_temp = heat_pump_state.attributes.get('temperature', self.comfort_temp if self.current_hvac_mode == "heat" else self.cooling_temp)
                 
@@ -617,7 +1036,7 @@ class SmartClimateCoordinator:
                 )
                 
                 await asyncio.sleep(20)
-                verify_state = self.hass.states.get(contact_sensor)
+                verify_state = self._states_get(contact_sensor)
                 
                 if verify_state and verify_state.state == "on":
                     _LOGGER.info(f"✅ Heat pump started after retry")
@@ -638,7 +1057,7 @@ class SmartClimateCoordinator:
                         }
                     )
         else:
-            _LOGGER.debug(f"✅ Heat pump verified running via contact sensor")
+            _LOGGER.debug("✅ Heat pump verified running via contact sensor")
             await self.hass.services.async_call(
                 "persistent_notification",
                 "dismiss",
@@ -648,30 +1067,66 @@ class SmartClimateCoordinator:
     async def _release_control(self) -> None:
         """Release control back to manual operation."""
         _LOGGER.info(f"Smart climate control releasing control of {self.heat_pump_entity_id}")
+        self._control_generation += 1
         
-        heat_pump_state = self.hass.states.get(self.heat_pump_entity_id)
+        heat_pump_state = self._states_get(self.heat_pump_entity_id)
         if heat_pump_state and heat_pump_state.state != "off":
             _LOGGER.info(f"Turning off heat pump {self.heat_pump_entity_id}")
             await self.hass.services.async_call(
                 "climate",
                 "turn_off",
-                {"entity_id": self.heat_pump_entity_id},
+                self._heat_pump_target,
                 blocking=False,
             )
         
         self.smart_control_active = False
-        self.last_sent_action = None
-        self.last_sent_temperature = None
-        self.last_sent_hvac_mode = None
+        self._last_input_hash = None
+        self._door_latched = False
+        self._cancel_door_open_timer()
+        self._cancel_pending_state_update()
+        if self._verify_task and not self._verify_task.done():
+            self._verify_task.cancel()
+        self._verify_task = None
+        self._last_sent = None
+        self._command_retry_at = 0.0
+        self._cancel_command_retry_timer()
+        self._last_published = None
         self.current_action = "off"
         self.debug_text = "Smart control disabled"
     
+    @property
+    def debug_text(self) -> str:
+        """Summary of the last control decision, formatted when first read."""
+        if self._debug_args is not None:
+            self._debug_text = self._format_debug_text(*self._debug_args)
+            self._debug_args = None
+        return self._debug_text
+    
+    @debug_text.setter
+    def debug_text(self, value: str) -> None:
+        """Set a fixed status text."""
+        self._debug_args = None
+        self._debug_text = value
+    
+    def _heating_mode_label(self) -> str:
+        """Return the heating mode shown in the debug text."""
+        if self.override_mode:
+            return "Force Comfort"
+        if self.force_eco_mode or self.sleep_mode_active:
+            return "Force Eco" if self.force_eco_mode else "Sleep Eco"
+        if self.schedule_mode == "boost":
+            return "Boost"
+        if self.schedule_mode == "eco":
+            return "Eco"
+        return "Comfort"
+    
     def _format_debug_text(
         self, action: str, temperature: Optional[float],
         room_temp: Optional[float], avg_house_temp: Optional[float],
         outside_temp: Optional[float], reason: str,
         original_temperature: Optional[float] = None, weather_compensation: float = 0,
-        has_outside_sensor: bool = True, mode: str = "heat"
+        has_outside_sensor: bool = True, mode: str = "heat",
+        mode_label: str = "Comfort"
     ) -> str:
         """Format debug text for display."""
         room_str = f"{room_temp:.1f}" if room_temp is not None else "N/A"
@@ -679,15 +1134,12 @@ class SmartClimateCoordinator:
         # Simplified for cooling mode
         if mode == "cool":
             if action == "off":
-                return f"COOL OFF | R: {room_str}°C | {reason}"
+                return self._TPL_COOL_OFF.format(room=room_str, reason=reason)
             else:
                 temp_str = f"{temperature}°C"
-                clean_reason = reason
-                if "Cooling needed (" in reason:
-                    clean_reason = "Cooling needed"
-                elif "Too cold (" in reason:
-                    clean_reason = "Too cold"
-                return f"COOL ON | {temp_str} | R: {room_str}°C | {clean_reason}"
+                # Thresholds are already shown, drop them from the reason
+                clean_reason = reason.partition(" (")[0]
+                return self._TPL_COOL_ON.format(temp=temp_str, room=room_str, reason=clean_reason)
         
         # Full display for heating mode
         avg_str = f"{avg_house_temp:.1f}" if avg_house_temp is not None else "N/A"
@@ -697,43 +1149,29 @@ class SmartClimateCoordinator:
             outside_str = "N/A"
         
         if action == "off":
-            return f"OFF | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {reason}"
+            return self._TPL_OFF.format(room=room_str, avg=avg_str, outside=outside_str, reason=reason)
         else:
-            if self.override_mode:
-                mode_str = "Force Comfort"
-            elif self.force_eco_mode or self.sleep_mode_active:
-                mode_str = "Force Eco" if self.force_eco_mode else "Sleep Eco"
-            elif self.schedule_mode == "boost":
-                mode_str = "Boost"
-            elif self.schedule_mode == "eco":
-                mode_str = "Eco"
-            else:
-                mode_str = "Comfort"
-            
             temp_str = f"{temperature}°C"
             if weather_compensation > 0 and original_temperature is not None:
                 temp_str = f"{temperature}°C (B:{original_temperature}°C +{weather_compensation:.1f}°C)"
             
-            clean_reason = reason
-            if "Heating needed (" in reason:
-                clean_reason = "Heating needed"
-            elif "Too hot (" in reason:
-                clean_reason = "Too hot"
+            # Thresholds are already shown, drop them from the reason
+            clean_reason = reason.partition(" (")[0]
                 
-            return f"ON | {mode_str} {temp_str} | R: {room_str}°C | H: {avg_str}°C | O: {outside_str} | {clean_reason}"
+            return self._TPL_ON.format(
+                mode=mode_label, temp=temp_str, room=room_str,
+                avg=avg_str, outside=outside_str, reason=clean_reason,
+            )
     
     async def enable_smart_control(self, enable: bool) -> None:
         """Enable or disable smart control."""
+        if enable == self.smart_control_enabled:
+            return
+        
         _LOGGER.info(f"Smart control {'enabled' if enable else 'disabled'}")
         self.smart_control_enabled = enable
         
-        await self.store.async_save({
-            "comfort_temp": self.comfort_temp,
-            "eco_temp": self.eco_temp,
-            "boost_temp": self.boost_temp,
-            "cooling_temp": self.cooling_temp,
-            "smart_control_enabled": self.smart_control_enabled,
-        })
+        self.async_save_settings()
         
         if not enable:
             await self._release_control()
@@ -743,7 +1181,7 @@ class SmartClimateCoordinator:
     @property
     def current_heat_pump_state(self) -> dict:
         """Get current state of the controlled heat pump."""
-        state = self.hass.states.get(self.heat_pump_entity_id)
+        state = self._states_get(self.heat_pump_entity_id)
         if state:
             return {
                 "hvac_mode": state.state,
@@ -755,17 +1193,15 @@ class SmartClimateCoordinator:
     
     async def reset_temperatures(self) -> None:
         """Reset temperatures to defaults."""
+        defaults = (DEFAULT_COMFORT_TEMP, DEFAULT_ECO_TEMP, DEFAULT_BOOST_TEMP, DEFAULT_COOLING_TEMP)
+        if (self.comfort_temp, self.eco_temp, self.boost_temp, self.cooling_temp) == defaults:
+            return
+        
         self.comfort_temp = DEFAULT_COMFORT_TEMP
         self.eco_temp = DEFAULT_ECO_TEMP
         self.boost_temp = DEFAULT_BOOST_TEMP
         self.cooling_temp = DEFAULT_COOLING_TEMP
         
-        await self.store.async_save({
-            "comfort_temp": self.comfort_temp,
-            "eco_temp": self.eco_temp,
-            "boost_temp": self.boost_temp,
-            "cooling_temp": self.cooling_temp,
-            "smart_control_enabled": self.smart_control_enabled,
-        })
+        self.async_save_settings()
         
         await self.async_update()
@@ -1,5 +1,5 @@
 import logging
-from typing import Any, List, Optional
+from typing import Any
 
 from homeassistant.components.climate import (
     ClimateEntity,
@@ -187,13 +187,7 @@ class SmartClimateEntity(ClimateEntity, RestoreEntity):
                 else:
                     self.coordinator.comfort_temp = temperature
             
-            await self.coordinator.store.async_save({
-                "comfort_temp": self.coordinator.comfort_temp,
-                "eco_temp": self.coordinator.eco_temp,
-                "boost_temp": self.coordinator.boost_temp,
-                "cooling_temp": self.coordinator.cooling_temp,
-                "smart_control_enabled": self.coordinator.smart_control_enabled,
-            })
+            self.coordinator.async_save_settings()
             
             await self.coordinator.async_update()
 
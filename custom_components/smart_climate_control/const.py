@@ -1,5 +1,12 @@
 DOMAIN = "smart_climate_control"
 
+EVENT_STATE_UPDATED = f"{DOMAIN}_state_updated"
+
+STORAGE_VERSION = 1
+STORAGE_MINOR_VERSION = 1
+# Seconds to coalesce settings changes before writing them to disk
+STORAGE_SAVE_DELAY = 10
+
 CONF_HEAT_PUMP = "heat_pump"
 CONF_ROOM_SENSOR = "room_sensor"
 CONF_OUTSIDE_SENSOR = "outside_sensor"
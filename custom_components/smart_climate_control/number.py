@@ -78,11 +78,6 @@ class SmartClimateTemperatureNumber(NumberEntity):
             self.coordinator.cooling_temp = value
         
         # Save to storage
-        await self.coordinator.store.async_save({
-            "comfort_temp": self.coordinator.comfort_temp,
-            "eco_temp": self.coordinator.eco_temp,
-            "boost_temp": self.coordinator.boost_temp,
-            "cooling_temp": self.coordinator.cooling_temp,
-        })
+        self.coordinator.async_save_settings()
         
         await self.coordinator.async_update()